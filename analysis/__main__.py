@@ -4,7 +4,7 @@ import os
 
 import pandas as pd
 
-from .simulation import run_scenarios
+from .simulation import baseline_simulation, run_scenarios, ubi_simulation
 from .charts import generate_all
 
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "outputs")
@@ -12,6 +12,8 @@ OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "outputs")
 
 def main():
     results = run_scenarios()
+    baseline_simulation.cache_clear()
+    ubi_simulation.cache_clear()
 
     # Print summary table
     print("\n" + "=" * 70)
@@ -7,38 +7,65 @@ market income.
 """
 
 import numpy as np
-from policyengine_us import Microsimulation
 
 from .constants import YEAR, CAPITAL_INCOME_VARS
 from .metrics import extract_results as _extract_results
+from .simulation import baseline_simulation, release_branch
 
 MULTIPLIERS = [1.0, 1.25, 1.5, 1.75, 2.0, 2.5, 3.0, 4.0, 5.0]
 
+# Scalar metrics kept per multiplier; each becomes one float column.
+SWEEP_COLUMNS = (
+    "multiplier", "capital_share", "market_gini", "net_gini",
+    "spm_poverty_rate", "fed_revenue", "state_revenue", "total_revenue",
+    "mean_net_income", "mean_market_income", "top_10_share",
+    "bottom_10_share", "top_20_share", "bottom_20_share",
+)
 
-def _apply_multiplier(baseline, branch_name, mult, positive_only=False):
-    """Create a branch with capital income scaled by mult.
+
+def _scale_non_negative(vals, mult):
+    """Return vals with non-negative entries multiplied by mult.
+
+    Negative entries (losses) are copied through unchanged. mult may be a
+    scalar or a column of multipliers with shape (S, 1), which yields one
+    scaled row per multiplier from a single broadcast over vals.
+    """
+    vals = np.asarray(vals, dtype=float)
+    mult = np.asarray(mult, dtype=float)
+    scaled = np.empty(np.broadcast_shapes(vals.shape, mult.shape))
+    scaled[...] = vals
+    np.multiply(vals, mult, out=scaled, where=vals >= 0)
+    return scaled
+
+
+def _apply_multipliers(baseline, branch_names, multipliers, positive_only=False):
+    """Create one branch per multiplier with capital income scaled.
+
+    Each capital income variable is read once and scaled for every
+    multiplier in a single (n_multipliers, n_records) broadcast.
 
     Args:
         baseline: Base Microsimulation.
-        branch_name: Name for the branch.
-        mult: Multiplier to apply.
+        branch_names: Branch name for each multiplier.
+        multipliers: Multipliers to apply.
         positive_only: If True, only scale non-negative values. Losses
             stay at their original level. This better models AI generating
             new capital returns without amplifying existing losses.
 
     Returns:
-        The branch simulation.
+        List of branch simulations, aligned with multipliers.
     """
-    branch = baseline.get_branch(branch_name)
+    branches = [baseline.get_branch(name) for name in branch_names]
+    mults = np.asarray(multipliers, dtype=float)[:, None]
     for var in CAPITAL_INCOME_VARS:
-        original = baseline.calculate(var, period=YEAR)
+        original = np.asarray(baseline.calculate(var, period=YEAR), dtype=float)
         if positive_only:
-            vals = np.array(original)
-            scaled = np.where(vals >= 0, vals * mult, vals)
-            branch.set_input(var, YEAR, scaled)
+            scaled = _scale_non_negative(original, mults)
         else:
-            branch.set_input(var, YEAR, original * mult)
-    return branch
+            scaled = original * mults
+        for branch, row in zip(branches, scaled):
+            branch.set_input(var, YEAR, row)
+    return branches
 
 
 def _capital_share(sim):
@@ -60,51 +87,59 @@ def run_sweep(multipliers=None, positive_only=True):
             including losses (not recommended — distorts bottom decile).
 
     Returns:
-        Dict with "baseline_capital_share", "rows" (list of per-multiplier
-        result dicts), and "meta".
+        Dict with "baseline_capital_share", "columns" (per-multiplier
+        metrics stored column-wise, see to_rows), "positive_only" and "meta".
     """
     if multipliers is None:
         multipliers = MULTIPLIERS
 
     mode = "positive-only" if positive_only else "all capital"
     print(f"Running baseline microsimulation ({mode} mode)...")
-    baseline = Microsimulation()
+    root = baseline_simulation()
+    baseline = root.get_branch("baseline")
 
     # Create ALL branches before computing anything downstream
-    branches = {}
-    for mult in multipliers:
-        if mult == 1.0:
-            continue
-        suffix = "_pos" if positive_only else ""
-        name = f"cap_{int(mult * 100)}{suffix}"
-        branches[mult] = _apply_multiplier(
-            baseline, name, mult, positive_only=positive_only
-        )
+    suffix = "_pos" if positive_only else ""
+    names = {
+        mult: f"cap_{int(mult * 100)}{suffix}"
+        for mult in multipliers if mult != 1.0
+    }
+    branches = dict(zip(names, _apply_multipliers(
+        root, list(names.values()), list(names), positive_only=positive_only,
+    )))
 
     baseline_cap_share = _capital_share(baseline)
     print(f"Baseline capital share of market income: {baseline_cap_share:.1%}")
 
-    weights = np.array(baseline.calculate("household_weight", period=YEAR))
+    weights = np.asarray(baseline.calculate("household_weight", period=YEAR))
     hh_people = baseline.calculate("household_count_people", period=YEAR)
     total_pop = float(hh_people.sum())
 
-    # Extract results for each multiplier
-    rows = []
-    for mult in multipliers:
+    # Extract results for each multiplier straight into column arrays
+    columns = {name: np.empty(len(multipliers)) for name in SWEEP_COLUMNS}
+    columns["label"] = []
+    columns["decile_shares"] = np.empty((len(multipliers), 10))
+    for i, mult in enumerate(multipliers):
         label = f"{mult:.2g}x" if mult != 1.0 else "Baseline"
         print(f"  Computing {label}...")
 
-        sim = baseline if mult == 1.0 else branches[mult]
-        r = _extract_results(sim, label)
+        sim = baseline if mult == 1.0 else branches.pop(mult)
+        r = _extract_results(sim, label, include_series=False)
         r["multiplier"] = mult
-
         r["capital_share"] = _capital_share(sim)
 
-        rows.append(r)
+        for name in SWEEP_COLUMNS:
+            columns[name][i] = r[name]
+        columns["label"].append(label)
+        columns["decile_shares"][i] = r["decile_shares"]
+        # The cached root outlives this sweep; let each branch go once read.
+        if mult != 1.0:
+            release_branch(root, names[mult])
+    release_branch(root, "baseline")
 
     return {
         "baseline_capital_share": baseline_cap_share,
-        "rows": rows,
+        "columns": columns,
         "positive_only": positive_only,
         "meta": {
             "year": YEAR,
@@ -113,3 +148,15 @@ def run_sweep(multipliers=None, positive_only=True):
             "multipliers": multipliers,
         },
     }
+
+
+def to_rows(columns):
+    """Convert run_sweep()'s "columns" into one result dict per multiplier."""
+    return [
+        {
+            "label": label,
+            **{name: float(columns[name][i]) for name in SWEEP_COLUMNS},
+            "decile_shares": columns["decile_shares"][i].tolist(),
+        }
+        for i, label in enumerate(columns["label"])
+    ]
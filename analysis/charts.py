@@ -5,8 +5,6 @@ import os
 import plotly.express as px
 import plotly.graph_objects as go
 
-from .metrics import lorenz_curve
-
 
 def generate_all(results, output_dir):
     """Generate and save all charts.
@@ -29,10 +27,10 @@ def _lorenz(results, output_dir):
     import numpy as np
 
     fig = go.Figure()
+    x = np.linspace(0, 1, 100)
     for key in ("baseline", "doubled", "ubi"):
         r = results[key]
-        series = r["_net_income"]
-        x, y = lorenz_curve(np.array(series.values), np.array(series.weights))
+        y = np.interp(x, *r["_lorenz_raw"])
         fig.add_trace(go.Scatter(x=x, y=y, name=r["label"], mode="lines"))
     fig.add_trace(
         go.Scatter(x=[0, 1], y=[0, 1], name="Perfect equality",
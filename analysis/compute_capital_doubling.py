@@ -29,10 +29,16 @@ def main():
 
     # Create branch and set all capital income inputs BEFORE computing
     branch = baseline.get_branch("doubled_capital")
+    total_cap_added = 0.0
     for var in CAPITAL_INCOME_VARS:
         original = baseline.calculate(var, period=YEAR)
         raw = np.array(original)
-        branch.set_input(var, YEAR, np.where(raw >= 0, raw * 2, raw))
+        w = np.array(original.weights)
+        pos = raw >= 0
+        doubled = raw.copy()
+        doubled[pos] *= 2
+        branch.set_input(var, YEAR, doubled)
+        total_cap_added += float((raw[pos] * w[pos]).sum())
 
     print("\nComputing baseline metrics...")
     base_metrics = _extract_results(baseline, "Baseline")
@@ -43,14 +49,6 @@ def main():
     doubled_rev = revenue_components(branch)
     delta = net_fiscal_impact(doubled_rev, base_rev)
 
-    # Total capital income added (weighted sum of additions)
-    total_cap_added = 0.0
-    for var in CAPITAL_INCOME_VARS:
-        vals = baseline.calculate(var, period=YEAR)
-        raw = np.array(vals)
-        w = np.array(vals.weights)
-        total_cap_added += float((np.where(raw >= 0, raw, 0) * w).sum())
-
     def _fmt(metrics, rev, delta=None):
         row = {
             "market_gini": metrics["market_gini"],
@@ -18,10 +18,10 @@ winners/losers chart.
 import json
 import os
 
-import numpy as np
 import pandas as pd
 
 from .compute_shift_sweep import OUTPUT_PATH
+from .metrics import assign_deciles
 
 MICRODATA_DIR = os.path.join(
     os.path.dirname(__file__), "outputs", "shift_sweep_microdata"
@@ -47,16 +47,7 @@ def main():
     net_base = baseline["household_net_income"].to_numpy()
 
     # Weighted deciles of baseline market income.
-    sorted_idx = np.argsort(market)
-    sorted_weights = weights[sorted_idx]
-    cum = np.cumsum(sorted_weights)
-    total = cum[-1]
-    decile_edges = [np.searchsorted(cum, total * i / 10) for i in range(1, 10)]
-    decile_labels = np.zeros_like(market, dtype=int)
-    decile_of_sorted = np.digitize(
-        np.arange(len(sorted_idx)), decile_edges, right=False
-    ) + 1
-    decile_labels[sorted_idx] = decile_of_sorted
+    decile_labels = assign_deciles(market, weights)
 
     # Pre-compute baseline per-decile aggregates.
     def _decile_stats(net_values, weights, decile_labels):
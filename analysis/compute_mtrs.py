@@ -105,26 +105,28 @@ def _apply_shift(baseline, pct):
 
     total_freed = float((emp * pct).sum() + (se * pct).sum())
 
+    cap_values = {}
+    cap_masks = {}
     cap_positive_totals = {}
     for var in CAPITAL_INCOME_VARS:
         vals = baseline.calculate(var, period=YEAR)
         raw = np.array(vals)
         w = np.array(vals.weights)
-        cap_positive_totals[var] = float(
-            (np.where(raw >= 0, raw, 0) * w).sum()
-        )
+        pos = raw >= 0
+        cap_values[var] = raw
+        cap_masks[var] = pos
+        cap_positive_totals[var] = float((raw[pos] * w[pos]).sum())
     total_positive = sum(cap_positive_totals.values())
 
     for var in CAPITAL_INCOME_VARS:
-        original = baseline.calculate(var, period=YEAR)
         pos_total = cap_positive_totals[var]
         if pos_total > 0 and total_positive > 0:
             share = pos_total / total_positive
             scale = 1 + (share * total_freed) / pos_total
-            vals = np.array(original)
-            branch.set_input(
-                var, YEAR, np.where(vals >= 0, vals * scale, vals)
-            )
+            # Losses stay as they are; only non-negative values are scaled.
+            scaled = cap_values[var].copy()
+            scaled[cap_masks[var]] *= scale
+            branch.set_input(var, YEAR, scaled)
 
     return branch
 
@@ -8,12 +8,11 @@ proportionally.
 """
 
 import numpy as np
-from policyengine_us import Microsimulation
-from policyengine_core.reforms import Reform
 
 from .constants import YEAR, CAPITAL_INCOME_VARS
 from .fiscal import compute_ubi_amount, net_fiscal_impact, revenue_components
 from .metrics import extract_results as _extract_results
+from .simulation import baseline_simulation, release_branch, ubi_simulation
 
 SHIFT_LEVELS = [0.10, 0.25, 0.50]
 
@@ -52,37 +51,59 @@ def _apply_shift(baseline, branch_name, shift_pct):
         + (se_reduction * se_weights).sum()
     )
 
-    # Compute POSITIVE-ONLY weighted totals for redistribution.
-    # Using positive totals for both shares and scale factors ensures
-    # that every freed dollar is redistributed (conservation of market income).
-    cap_positive_totals = {}
-    for var in CAPITAL_INCOME_VARS:
-        vals = baseline.calculate(var, period=YEAR)
-        raw = np.array(vals)
-        w = np.array(vals.weights)
-        cap_positive_totals[var] = float((np.where(raw > 0, raw, 0) * w).sum())
-
-    total_positive_cap = sum(cap_positive_totals.values())
-
-    for var in CAPITAL_INCOME_VARS:
-        original = baseline.calculate(var, period=YEAR)
-        pos_total = cap_positive_totals[var]
-        if pos_total > 0 and total_positive_cap > 0:
-            share = pos_total / total_positive_cap
-            scale = 1 + (share * total_freed) / pos_total
-            vals = np.array(original)
-            scaled = np.where(vals > 0, vals * scale, vals)
-            branch.set_input(var, YEAR, scaled)
+    cap_values = [
+        baseline.calculate(var, period=YEAR) for var in CAPITAL_INCOME_VARS
+    ]
+    # Capital income variables are person-level, so they share one weight
+    # vector.
+    scaled = _redistribute_capital(
+        np.stack([np.asarray(v, dtype=float) for v in cap_values]),
+        np.asarray(cap_values[0].weights, dtype=float),
+        total_freed,
+    )
+    for var, vals in zip(CAPITAL_INCOME_VARS, scaled):
+        branch.set_input(var, YEAR, vals)
 
     return branch, total_freed
 
 
-def run_scenarios(shift_levels=None):
+def _redistribute_capital(values, weights, total_freed):
+    """Scale positive capital income so it absorbs total_freed in aggregate.
+
+    Args:
+        values: (n_vars, n_records) array of capital income by variable.
+        weights: Record weights shared by every variable, shape (n_records,).
+        total_freed: Weighted labor income to redistribute.
+
+    Returns:
+        Array shaped like values with positive entries scaled up.
+
+    Using positive totals for both shares and scale factors ensures that
+    every freed dollar is redistributed (conservation of market income).
+    Variables with no positive holdings are returned unchanged.
+    """
+    positive = values > 0
+    totals = np.where(positive, values, 0) @ weights
+    total_positive_cap = float(totals.sum())
+    if total_positive_cap > 0:
+        shares = totals / total_positive_cap
+    else:
+        shares = np.zeros_like(totals)
+    scales = 1.0 + np.divide(
+        shares * total_freed, totals,
+        out=np.zeros_like(totals), where=totals > 0,
+    )
+    return np.where(positive, values * scales[:, None], values)
+
+
+def run_scenarios(shift_levels=None, include_series=True):
     """Run labor→capital shift scenarios at multiple shift levels.
 
     Args:
         shift_levels: List of floats (e.g. [0.10, 0.25, 0.50]).
             Defaults to SHIFT_LEVELS.
+        include_series: Keep raw MicroSeries in each scenario's results
+            (see metrics.extract_results).
 
     Returns:
         Dict with keys "baseline", "shifts" (list of per-level results),
@@ -92,27 +113,30 @@ def run_scenarios(shift_levels=None):
         shift_levels = SHIFT_LEVELS
 
     print("Running baseline microsimulation...")
-    baseline = Microsimulation()
+    root = baseline_simulation()
+    baseline = root.get_branch("baseline")
 
     # Create all branches BEFORE computing any downstream variables
     branches = {}
     for pct in shift_levels:
         name = f"shift_{int(pct * 100)}"
         print(f"Creating {int(pct * 100)}% labor→capital shift branch...")
-        branch, freed = _apply_shift(baseline, name, pct)
+        branch, freed = _apply_shift(root, name, pct)
         branches[pct] = (branch, freed)
 
-    weights = np.array(baseline.calculate("household_weight", period=YEAR))
+    weights = np.asarray(baseline.calculate("household_weight", period=YEAR))
     hh_count_people = baseline.calculate("household_count_people", period=YEAR)
     total_population = float(hh_count_people.sum())
 
-    baseline_results = _extract_results(baseline, "Baseline")
+    baseline_results = _extract_results(
+        baseline, "Baseline", include_series=include_series
+    )
 
     shift_results = []
     for pct in shift_levels:
         branch, freed = branches[pct]
         label = f"{int(pct * 100)}% shift"
-        r = _extract_results(branch, label)
+        r = _extract_results(branch, label, include_series=include_series)
         r["shift_pct"] = pct
         r["total_freed"] = freed
         shift_results.append(r)
@@ -120,6 +144,14 @@ def run_scenarios(shift_levels=None):
     # UBI scenario: use the largest shift's net fiscal gain to fund UBI
     baseline_fiscal = revenue_components(baseline)
     largest_fiscal = revenue_components(branches[shift_levels[-1]][0])
+
+    # The cached root outlives this run; let the extracted branches go
+    # before the UBI simulation is built.
+    branches.clear()
+    release_branch(root, "baseline")
+    for pct in shift_levels:
+        release_branch(root, f"shift_{int(pct * 100)}")
+
     extra_budget = net_fiscal_impact(
         largest_fiscal, baseline_fiscal
     )["total_change"]
@@ -130,17 +162,13 @@ def run_scenarios(shift_levels=None):
         print(f"UBI from {int(shift_levels[-1] * 100)}% shift: "
               f"${ubi_amount:,.2f}/person/year (${ubi_amount/12:,.2f}/month)")
 
-        reform = Reform.from_dict({
-            "gov.contrib.ubi_center.basic_income.amount.person.flat": {
-                f"{YEAR}-01-01.2100-12-31": round(ubi_amount, 2)
-            },
-        }, country_id="us")
-
-        ubi_sim = Microsimulation(reform=reform)
-        ubi_branch, _ = _apply_shift(ubi_sim, "shift_ubi", shift_levels[-1])
+        ubi_root = ubi_simulation(round(ubi_amount, 2))
+        ubi_branch, _ = _apply_shift(ubi_root, "shift_ubi", shift_levels[-1])
         ubi_results = _extract_results(
-            ubi_branch, f"{int(shift_levels[-1] * 100)}% shift + UBI"
+            ubi_branch, f"{int(shift_levels[-1] * 100)}% shift + UBI",
+            include_series=include_series,
         )
+        release_branch(ubi_root, "shift_ubi")
         ubi_results["ubi_per_person"] = ubi_amount
 
     return {
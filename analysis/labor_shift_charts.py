@@ -5,8 +5,6 @@ import os
 import numpy as np
 import plotly.graph_objects as go
 
-from .metrics import lorenz_curve
-
 
 def generate_all(results, output_dir):
     """Generate and save all labor shift charts.
@@ -17,28 +15,31 @@ def generate_all(results, output_dir):
     """
     os.makedirs(output_dir, exist_ok=True)
 
-    _gini_comparison(results, output_dir)
-    _decile_shares(results, output_dir)
-    _lorenz(results, output_dir)
-    _poverty_comparison(results, output_dir)
+    # Canonical scenario ordering shared by every chart.
+    rows = [
+        results["baseline"],
+        *results["shifts"],
+        *([results["ubi"]] if results["ubi"] else []),
+    ]
+    labels = [r["label"] for r in rows]
 
-    print(f"  Saved 4 interactive charts to {output_dir}")
+    _gini_comparison(rows, labels, output_dir)
+    _decile_shares(rows, labels, output_dir)
+    _lorenz(rows, labels, output_dir)
+    _poverty_comparison(rows, labels, output_dir)
 
+    print(f"  Saved 4 interactive charts to {output_dir}")
 
-def _gini_comparison(results, output_dir):
-    all_rows = [results["baseline"]] + results["shifts"]
-    if results["ubi"]:
-        all_rows.append(results["ubi"])
-    scenarios = [r["label"] for r in all_rows]
 
+def _gini_comparison(rows, labels, output_dir):
     fig = go.Figure()
     fig.add_trace(go.Bar(
-        name="Market Gini", x=scenarios,
-        y=[r["market_gini"] for r in all_rows],
+        name="Market Gini", x=labels,
+        y=[r["market_gini"] for r in rows],
     ))
     fig.add_trace(go.Bar(
-        name="Resources incl. health", x=scenarios,
-        y=[r["net_gini_including_health_benefits"] for r in all_rows],
+        name="Resources incl. health", x=labels,
+        y=[r["net_gini_including_health_benefits"] for r in rows],
     ))
 
     fig.update_layout(
@@ -47,20 +48,19 @@ def _gini_comparison(results, output_dir):
         barmode="group",
         width=800, height=500,
     )
-    fig.write_html(os.path.join(output_dir, "gini_comparison.html"))
+    fig.write_html(
+        os.path.join(output_dir, "gini_comparison.html"), include_plotlyjs="cdn"
+    )
 
 
-def _decile_shares(results, output_dir):
-    labels = [f"D{i+1}" for i in range(10)]
-    all_rows = [results["baseline"]] + results["shifts"]
-    if results["ubi"]:
-        all_rows.append(results["ubi"])
+def _decile_shares(rows, labels, output_dir):
+    deciles = [f"D{i+1}" for i in range(10)]
 
     fig = go.Figure()
-    for r in all_rows:
+    for r, label in zip(rows, labels):
         fig.add_trace(go.Bar(
-            name=r["label"],
-            x=labels,
+            name=label,
+            x=deciles,
             y=r["decile_shares_including_health_benefits"],
         ))
 
@@ -72,20 +72,18 @@ def _decile_shares(results, output_dir):
         barmode="group",
         width=800, height=500,
     )
-    fig.write_html(os.path.join(output_dir, "decile_shares.html"))
+    fig.write_html(
+        os.path.join(output_dir, "decile_shares.html"), include_plotlyjs="cdn"
+    )
 
 
-def _lorenz(results, output_dir):
+def _lorenz(rows, labels, output_dir):
     fig = go.Figure()
 
-    all_rows = [results["baseline"]] + results["shifts"]
-    if results["ubi"]:
-        all_rows.append(results["ubi"])
-
-    for r in all_rows:
-        series = r["_net_income_including_health_benefits"]
-        x, y = lorenz_curve(np.array(series.values), np.array(series.weights))
-        fig.add_trace(go.Scatter(x=x, y=y, name=r["label"], mode="lines"))
+    x = np.linspace(0, 1, 100)
+    for r, label in zip(rows, labels):
+        y = np.interp(x, *r["_lorenz_raw_including_health_benefits"])
+        fig.add_trace(go.Scatter(x=x, y=y, name=label, mode="lines"))
 
     fig.add_trace(go.Scatter(
         x=[0, 1], y=[0, 1], name="Perfect equality",
@@ -98,20 +96,22 @@ def _lorenz(results, output_dir):
         yaxis_title="Cumulative resource share",
         width=800, height=600,
     )
-    fig.write_html(os.path.join(output_dir, "lorenz_curves.html"))
+    fig.write_html(
+        os.path.join(output_dir, "lorenz_curves.html"), include_plotlyjs="cdn"
+    )
 
 
-def _poverty_comparison(results, output_dir):
-    all_rows = [results["baseline"]] + results["shifts"]
-    if results["ubi"]:
-        all_rows.append(results["ubi"])
+def _poverty_comparison(rows, labels, output_dir):
+    # Baseline first; the UBI scenario is the only row carrying a payment.
+    colors = ["#636EFA"] + [
+        "#00CC96" if "ubi_per_person" in r else "#EF553B" for r in rows[1:]
+    ]
 
     fig = go.Figure()
     fig.add_trace(go.Bar(
-        x=[r["label"] for r in all_rows],
-        y=[r["spm_poverty_rate"] for r in all_rows],
-        marker_color=["#636EFA"] + ["#EF553B"] * len(results["shifts"])
-        + (["#00CC96"] if results["ubi"] else []),
+        x=labels,
+        y=[r["spm_poverty_rate"] for r in rows],
+        marker_color=colors,
     ))
 
     fig.update_layout(
@@ -120,4 +120,6 @@ def _poverty_comparison(results, output_dir):
         yaxis_tickformat=".1%",
         width=800, height=500,
     )
-    fig.write_html(os.path.join(output_dir, "poverty_comparison.html"))
+    fig.write_html(
+        os.path.join(output_dir, "poverty_comparison.html"), include_plotlyjs="cdn"
+    )
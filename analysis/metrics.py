@@ -1,5 +1,8 @@
 """Utility functions for inequality metrics not provided by microdf."""
 
+from dataclasses import dataclass
+from functools import lru_cache
+
 import numpy as np
 
 from .constants import YEAR
@@ -7,6 +10,42 @@ from .constants import YEAR
 TOP_SHARE_FRACTIONS = (0.10, 0.01, 0.001)
 
 
+@dataclass(frozen=True)
+class SortedWeighted:
+    """A weighted distribution sorted once for reuse across metrics.
+
+    Build with sorted_weighted() and pass in place of (values, weights) to
+    weighted_gini, compute_decile_shares and lorenz_curve.
+
+    Attributes:
+        cumw: Running weight in value order, with a leading zero.
+        cumwv: Running weighted income in value order, with a leading zero.
+    """
+
+    cumw: np.ndarray
+    cumwv: np.ndarray
+
+
+def _as_float64(x):
+    """Coerce to a C-contiguous float64 array.
+
+    Returns x itself when it already qualifies, so metrics can call this on
+    every entry without copying arrays that were coerced upstream.
+    """
+    return np.ascontiguousarray(x, dtype=np.float64)
+
+
+def _require_weights(weights):
+    """Reject a missing weights argument outside the SortedWeighted path."""
+    if weights is None:
+        raise TypeError("weights required unless values is a SortedWeighted")
+
+
+def sorted_weighted(values, weights):
+    """Sort (values, weights) once and return a reusable SortedWeighted."""
+    return SortedWeighted(*_cumulative_by_value(values, weights))
+
+
 def _calculate_first_available(sim, variable_names, *, period=None, map_to=None):
     """Calculate the first available variable in priority order.
 
@@ -26,53 +65,161 @@ def _calculate_first_available(sim, variable_names, *, period=None, map_to=None)
     raise ValueError("No candidate variable names were provided.")
 
 
-def compute_decile_shares(values, weights, n=10):
+def compute_decile_shares(values, weights=None, n=10):
     """Compute income shares by quantile.
 
     Args:
-        values: Array of income values.
-        weights: Array of corresponding weights.
+        values: Array of income values, or a SortedWeighted.
+        weights: Array of corresponding weights (omit for SortedWeighted).
         n: Number of quantile groups (default 10 for deciles).
 
     Returns:
-        List of n floats summing to 1.0 (share of total income per group).
+        Array of n floats summing to 1.0 (share of total income per group).
     """
-    values = np.asarray(values, dtype=float)
-    weights = np.asarray(weights, dtype=float)
+    if n <= 0:
+        raise ValueError("n must be positive")
+    if isinstance(values, SortedWeighted):
+        return _decile_shares_from_cumulative(values.cumw, values.cumwv, n=n)
+
+    _require_weights(weights)
+    values = _as_float64(values)
+    weights = _as_float64(weights)
+    if _is_constant(values) and values[0] >= 0 and weights.sum() > 0:
+        # Every bucket holds 1/n of the weight and so 1/n of the income.
+        # Non-positive totals are left unnormalized, so negative constants
+        # take the general path.
+        return np.full(n, 0.0 if values[0] == 0 else 1.0 / n)
+    if weights.size and weights[0] > 0 and np.all(weights == weights[0]):
+        return _uniform_decile_shares(values, weights[0], n)
+
+    return _decile_shares_from_cumulative(
+        *_cumulative_by_value(values, weights), n=n
+    )
+
+
+def assign_deciles(values, weights, n=10):
+    """Label each record with its weighted quantile group, 1 through n.
 
+    Records are ranked by value and a new group starts at the first record
+    whose cumulative weight reaches each multiple of total_weight / n, so
+    every record lands in exactly one group. Tied values are ranked in input
+    order (stable sort), which decides the side of an edge a tie falls on.
+    Labels follow input order.
+    """
     if n <= 0:
         raise ValueError("n must be positive")
 
-    idx = np.argsort(values)
+    values = _as_float64(values)
+    weights = _as_float64(weights)
+    labels = np.empty(values.size, dtype=int)
+    if not values.size:
+        return labels
+
+    order = np.argsort(values, kind="stable")
+    cum = np.cumsum(weights[order])
+    # Sorted position where each group after the first begins; one binary
+    # search per edge, then one per record to read off its group.
+    edges = np.searchsorted(cum, cum[-1] * np.arange(1, n) / n)
+    labels[order] = np.searchsorted(edges, np.arange(values.size), side="right") + 1
+    return labels
+
+
+def _is_constant(values):
+    """True if a non-empty array holds a single repeated value (no sort)."""
+    return values.size > 0 and values.min() == values.max()
+
+
+def _uniform_decile_shares(values, weight, n):
+    """Quantile shares for equally weighted records without a full sort.
+
+    With equal weights the bucket edges fall at fixed ranks, so partitioning
+    around those ranks (O(N)) groups the records correctly; order within a
+    bucket does not matter. A record straddling an edge is split by the
+    fractional part of the edge rank, as in the weighted path.
+    """
+    size = values.size
+    edges = np.linspace(0.0, size, n + 1)
+    ranks = np.minimum(np.floor(edges).astype(int), size)
+    kth = np.unique(ranks[(ranks > 0) & (ranks < size)])
+    values = np.partition(values, kth) if kth.size else values
+
+    # Sum the whole records in every bucket in one segmented pass. reduceat
+    # yields the start element for an empty segment, so those are zeroed.
+    sums = np.add.reduceat(values, np.minimum(ranks[:-1], size - 1))
+    sums[ranks[:-1] == ranks[1:]] = 0.0
+    straddling = (edges - ranks) * values[np.minimum(ranks, size - 1)]
+    shares = (sums + np.diff(straddling)) * weight
+
+    total = float(values.sum() * weight)
+    return shares / total if total > 0 else shares
+
+
+def _cumulative_by_value(values, weights):
+    """Sort records by value and return (cumw, cumwv) with a leading zero.
+
+    cumw is the running weight and cumwv the running weighted income, so the
+    pair traces the unnormalized Lorenz curve from the origin. Gini, quantile
+    shares and Lorenz points can all be read off it without sorting again.
+    """
+    values = _as_float64(values)
+    weights = _as_float64(weights)
+
+    # A stable sort keeps tied records in input order, so results do not
+    # depend on which SIMD argsort kernel NumPy picks on a given machine.
+    idx = np.argsort(values, kind="stable")
     values, weights = values[idx], weights[idx]
 
-    total_w = float(weights.sum())
+    cumw = np.concatenate([[0.0], np.cumsum(weights)])
+    cumwv = np.concatenate([[0.0], np.cumsum(values * weights)])
+    return cumw, cumwv
+
+
+def _decile_shares_from_cumulative(cumw, cumwv, n=10):
+    """Quantile income shares from _cumulative_by_value output."""
+    total_w = float(cumw[-1])
     if total_w <= 0:
-        return [0.0] * n
+        return np.zeros(n)
 
     # Split each weighted record across quantile boundaries instead of
-    # assigning the full record to a single bucket.
-    lower_bounds = np.concatenate([[0.0], np.cumsum(weights[:-1])])
-    upper_bounds = lower_bounds + weights
+    # assigning the full record to a single bucket. Cumulative income is
+    # piecewise linear in cumulative weight, so interpolating it at the bucket
+    # edges apportions every record exactly.
     bucket_edges = np.linspace(0.0, total_w, n + 1)
-    shares = np.zeros(n, dtype=float)
+    shares = np.diff(np.interp(bucket_edges, cumw, cumwv))
 
-    bucket_idx = 0
-    for value, lower, upper in zip(values, lower_bounds, upper_bounds):
-        while bucket_idx < n and bucket_edges[bucket_idx + 1] <= lower:
-            bucket_idx += 1
+    total = float(cumwv[-1])
+    return shares / total if total > 0 else shares
 
-        current_idx = bucket_idx
-        while current_idx < n and bucket_edges[current_idx] < upper:
-            overlap = min(upper, bucket_edges[current_idx + 1]) - max(
-                lower, bucket_edges[current_idx]
-            )
-            if overlap > 0:
-                shares[current_idx] += value * overlap
-            current_idx += 1
 
-    total = float(shares.sum())
-    return list(shares / total) if total > 0 else list(shares)
+def weighted_gini(values, weights=None):
+    """Compute the weighted Gini coefficient.
+
+    Matches MicroSeries.gini(). Accepts a SortedWeighted in place of
+    (values, weights); either way the result comes from the same cumulative
+    sums that back the decile shares and Lorenz curve.
+    """
+    if isinstance(values, SortedWeighted):
+        return _gini_from_cumulative(values.cumw, values.cumwv)
+    _require_weights(weights)
+    values = _as_float64(values)
+    if _is_constant(values):
+        return 0.0
+    return _gini_from_cumulative(*_cumulative_by_value(values, weights))
+
+
+def _gini_from_cumulative(cumw, cumwv):
+    """Weighted Gini from _cumulative_by_value output.
+
+    Uses the rank-weighted form G = sum(w*v*(W_prev + W)) / (W_tot * Y_tot) - 1,
+    where each record sits at the midpoint of its cumulative weight span. It
+    is algebraically identical to the trapezoidal formula in MicroSeries.gini()
+    but needs one fused product-sum over the records.
+    """
+    total = float(cumwv[-1])
+    if total == 0:
+        return 0.0
+    ranked = np.dot(np.diff(cumwv), cumw[:-1] + cumw[1:])
+    return float(ranked / (total * cumw[-1]) - 1.0)
 
 
 def compute_top_share(values, weights, top_fraction):
@@ -81,87 +228,144 @@ def compute_top_share(values, weights, top_fraction):
     Splits weighted records across the cutoff when a household weight spans the
     threshold separating the top group from the rest of the distribution.
     """
-    values = np.asarray(values, dtype=float)
-    weights = np.asarray(weights, dtype=float)
+    return compute_top_shares(values, weights, top_fractions=(top_fraction,))[
+        top_fraction
+    ]
 
-    if not 0 < top_fraction <= 1:
-        raise ValueError("top_fraction must be between 0 and 1")
 
-    idx = np.argsort(values)
-    values, weights = values[idx], weights[idx]
+def compute_top_shares(values, weights=None, top_fractions=TOP_SHARE_FRACTIONS):
+    """Return a mapping of weighted top-share cutoffs to income shares.
 
-    total_w = float(weights.sum())
-    if total_w <= 0:
-        return 0.0
-
-    total_income = float((values * weights).sum())
-    if total_income == 0:
-        return 0.0
-
-    cutoff = (1 - top_fraction) * total_w
-    lower_bounds = np.concatenate([[0.0], np.cumsum(weights[:-1])])
-    upper_bounds = lower_bounds + weights
-
-    top_income = 0.0
-    for value, lower, upper in zip(values, lower_bounds, upper_bounds):
-        overlap = upper - max(lower, cutoff)
-        if overlap > 0:
-            top_income += value * overlap
-
-    return top_income / total_income
+    Accepts a SortedWeighted in place of (values, weights). Otherwise only
+    the top tail needed for the largest fraction is partitioned out and
+    sorted. Every cutoff is read off that one cumulative income curve.
+    """
+    fractions = np.asarray(top_fractions, dtype=float)
+    if not np.all((fractions > 0) & (fractions <= 1)):
+        raise ValueError("top_fraction must be between 0 and 1")
 
+    if isinstance(values, SortedWeighted):
+        cumw, cumwv = values.cumw, values.cumwv
+    else:
+        _require_weights(weights)
+        cumw, cumwv = _top_tail_cumulative(
+            _as_float64(values), _as_float64(weights), float(fractions.max())
+        )
+
+    total_w = float(cumw[-1])
+    total_income = float(cumwv[-1])
+    if total_w <= 0 or total_income == 0:
+        return {top_fraction: 0.0 for top_fraction in top_fractions}
+
+    # Cumulative income is piecewise linear in cumulative weight, so the
+    # income below each cutoff splits the straddling record exactly.
+    income_below = np.interp((1 - fractions) * total_w, cumw, cumwv)
+    shares = (total_income - income_below) / total_income
+    return dict(zip(top_fractions, shares.tolist()))
+
+
+def _top_tail_cumulative(values, weights, top_fraction):
+    """Cumulative curve covering only the top top_fraction of weight.
+
+    Partitions out the highest-valued records (O(N)) and sorts just that
+    tail, doubling it until it carries at least top_fraction of the total
+    weight. The curve starts at the weight and income below the tail, so
+    lookups at or above the cutoff match a full _cumulative_by_value.
+    """
+    size = values.size
+    total_w = float(weights.sum())
+    total_income = float(np.dot(values, weights))
+
+    k = max(1, int(np.ceil(top_fraction * size)))
+    while k < size:
+        tail = np.argpartition(values, size - k)[size - k:]
+        tail_w = float(weights[tail].sum())
+        if tail_w >= top_fraction * total_w:
+            break
+        k *= 2
+    else:
+        return _cumulative_by_value(values, weights)
 
-def compute_top_shares(values, weights, top_fractions=TOP_SHARE_FRACTIONS):
-    """Return a mapping of weighted top-share cutoffs to income shares."""
-    return {
-        top_fraction: compute_top_share(values, weights, top_fraction)
-        for top_fraction in top_fractions
-    }
+    order = tail[np.argsort(values[tail], kind="stable")]
+    v, w = values[order], weights[order]
+    below_w = total_w - tail_w
+    below_income = total_income - float(np.dot(v, w))
+    cumw = np.concatenate([[below_w], below_w + np.cumsum(w)])
+    cumwv = np.concatenate([[below_income], below_income + np.cumsum(v * w)])
+    return cumw, cumwv
 
 
-def lorenz_curve(values, weights, n_points=100):
+def lorenz_curve(values, weights=None, n_points=100):
     """Compute Lorenz curve points.
 
     Args:
-        values: Array of income values.
-        weights: Array of corresponding weights.
+        values: Array of income values, or a SortedWeighted.
+        weights: Array of corresponding weights (omit for SortedWeighted).
         n_points: Number of evenly spaced points to return.
 
     Returns:
         Tuple of (x, y) arrays where x is cumulative population share
-        and y is cumulative income share.
+        and y is cumulative income share. x is a shared read-only grid
+        cached per n_points; copy it before modifying.
     """
-    values = np.asarray(values, dtype=float)
-    weights = np.asarray(weights, dtype=float)
+    x = _linspace_01(n_points)
+    if not isinstance(values, SortedWeighted):
+        _require_weights(weights)
+        values = _as_float64(values)
+        if _is_constant(values) and np.sum(weights) > 0:
+            return x, x.copy()
+
+    pop_fracs, income_fracs = _lorenz_raw(values, weights)
+    return x, np.interp(x, pop_fracs, income_fracs)
 
-    idx = np.argsort(values)
-    values, weights = values[idx], weights[idx]
 
-    cumw = np.cumsum(weights)
-    cumwv = np.cumsum(values * weights)
-    total_w, total_wv = cumw[-1], cumwv[-1]
+@lru_cache(maxsize=8)
+def _linspace_01(n_points):
+    """Return a shared, read-only grid of n_points evenly spaced on [0, 1]."""
+    x = np.linspace(0.0, 1.0, n_points)
+    x.setflags(write=False)
+    return x
+
 
-    pop_fracs = np.concatenate([[0], cumw / total_w])
-    if total_wv > 0:
-        income_fracs = np.concatenate([[0], cumwv / total_wv])
+def _lorenz_raw(values, weights=None):
+    """Return the unsampled Lorenz curve as (pop_fracs, income_fracs).
+
+    Both arrays start at 0 and have one point per record, so callers can
+    interpolate onto any grid without re-sorting the underlying data.
+    """
+    if isinstance(values, SortedWeighted):
+        return _lorenz_from_cumulative(values.cumw, values.cumwv)
+    return _lorenz_from_cumulative(*_cumulative_by_value(values, weights))
+
+
+def _lorenz_from_cumulative(cumw, cumwv):
+    """Normalize _cumulative_by_value output into Lorenz fractions."""
+    pop_fracs = cumw / cumw[-1]
+    if cumwv[-1] > 0:
+        income_fracs = cumwv / cumwv[-1]
     else:
         income_fracs = pop_fracs.copy()
 
-    x = np.linspace(0, 1, n_points)
-    return x, np.interp(x, pop_fracs, income_fracs)
+    return pop_fracs, income_fracs
 
 
-def extract_results(sim, label, year=YEAR):
+def extract_results(sim, label, year=YEAR, include_series=True):
     """Extract standard metrics from a simulation or branch.
 
     Returns a dict with core inequality/poverty/revenue metrics plus
-    raw MicroSeries for downstream use (charts, state breakdowns).
+    raw MicroSeries for downstream use (charts, state breakdowns). Pass
+    include_series=False to drop the raw MicroSeries when only the scalar
+    metrics, decile shares and cached Lorenz inputs are needed.
 
     Includes both standard post-tax income metrics and a broader household
     resources concept that adds the cash-equivalent value of health coverage
     support (e.g. Medicaid, CHIP, ACA premium tax credits).
 
-    Uses MicroSeries.gini() from microdf for Gini calculation.
+    Uses MicroSeries.gini() from microdf for the market income Gini. Net
+    income Ginis come from float64 cumulative sums shared with the decile
+    shares and Lorenz curve, so each series is sorted once. They are
+    algebraically equal to MicroSeries.gini() but can differ from it in the
+    last digits (working precision, summation order and tie order).
     """
     net_income = sim.calculate("household_net_income", period=year)
     net_income_including_health_benefits = sim.calculate(
@@ -185,21 +389,33 @@ def extract_results(sim, label, year=YEAR):
         "spm_unit_is_in_spm_poverty", map_to="person", period=year
     )
 
-    decile_shares = compute_decile_shares(
-        np.array(net_income.values), np.array(net_income.weights)
+    # Sort each net income concept once and derive its Gini, decile shares
+    # and Lorenz curve from the shared cumulative sums.
+    net_sorted = sorted_weighted(
+        _as_float64(net_income.values), _as_float64(net_income.weights)
     )
-    decile_shares_including_health_benefits = compute_decile_shares(
-        np.array(net_income_including_health_benefits.values),
-        np.array(net_income_including_health_benefits.weights),
+    net_sorted_including_health_benefits = sorted_weighted(
+        _as_float64(net_income_including_health_benefits.values),
+        _as_float64(net_income_including_health_benefits.weights),
     )
+
+    # Stored as lists so the results stay JSON-serializable.
+    decile_shares = compute_decile_shares(net_sorted).tolist()
+    decile_shares_including_health_benefits = compute_decile_shares(
+        net_sorted_including_health_benefits
+    ).tolist()
     market_top_shares = compute_top_shares(
-        np.array(market_income.values), np.array(market_income.weights)
+        _as_float64(market_income.values), _as_float64(market_income.weights)
     )
-    net_top_shares = compute_top_shares(
-        np.array(net_income.values), np.array(net_income.weights)
+    net_top_shares = compute_top_shares(net_sorted)
+    # Lorenz inputs are cached here because the underlying series never
+    # change after extraction; charts only need to interpolate them.
+    lorenz_raw = _lorenz_raw(net_sorted)
+    lorenz_raw_including_health_benefits = _lorenz_raw(
+        net_sorted_including_health_benefits
     )
 
-    return {
+    results = {
         "label": label,
         "mean_net_income": float(net_income.mean()),
         "mean_net_income_including_health_benefits": float(
@@ -207,9 +423,9 @@ def extract_results(sim, label, year=YEAR):
         ),
         "mean_market_income": float(market_income.mean()),
         "market_gini": float(market_income.gini()),
-        "net_gini": float(net_income.gini()),
-        "net_gini_including_health_benefits": float(
-            net_income_including_health_benefits.gini()
+        "net_gini": weighted_gini(net_sorted),
+        "net_gini_including_health_benefits": weighted_gini(
+            net_sorted_including_health_benefits
         ),
         "spm_poverty_rate": float(in_poverty.mean()),
         "fed_revenue": float(income_tax.sum()),
@@ -246,11 +462,21 @@ def extract_results(sim, label, year=YEAR):
             decile_shares_including_health_benefits[0]
             + decile_shares_including_health_benefits[1]
         ),
-        # Raw MicroSeries for downstream use (charts, state breakdown)
-        "_net_income": net_income,
-        "_net_income_including_health_benefits": (net_income_including_health_benefits),
-        "_market_income": market_income,
-        "_income_tax": income_tax,
-        "_state_income_tax": state_income_tax,
-        "_healthcare_benefit_value": healthcare_benefit_value,
+        "_lorenz_raw": lorenz_raw,
+        "_lorenz_raw_including_health_benefits": (
+            lorenz_raw_including_health_benefits
+        ),
     }
+    if include_series:
+        # Raw MicroSeries for downstream use (charts, state breakdown)
+        results.update({
+            "_net_income": net_income,
+            "_net_income_including_health_benefits": (
+                net_income_including_health_benefits
+            ),
+            "_market_income": market_income,
+            "_income_tax": income_tax,
+            "_state_income_tax": state_income_tax,
+            "_healthcare_benefit_value": healthcare_benefit_value,
+        })
+    return results
@@ -5,6 +5,7 @@ import os
 import pandas as pd
 
 from .capital_share_sweep import run_sweep
+from .simulation import baseline_simulation
 from .sweep_charts import generate_all as generate_charts
 
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "outputs", "capital_sweep")
@@ -12,25 +13,18 @@ OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "outputs", "capital_sweep")
 
 def main():
     results = run_sweep()
-
-    # Build results DataFrame
-    rows = results["rows"]
-    df = pd.DataFrame([{
-        "multiplier": r["multiplier"],
-        "capital_share": r["capital_share"],
-        "label": r["label"],
-        "market_gini": r["market_gini"],
-        "net_gini": r["net_gini"],
-        "spm_poverty_rate": r["spm_poverty_rate"],
-        "fed_revenue": r["fed_revenue"],
-        "state_revenue": r["state_revenue"],
-        "total_revenue": r["total_revenue"],
-        "mean_net_income": r["mean_net_income"],
-        "top_10_share": r["top_10_share"],
-        "bottom_10_share": r["bottom_10_share"],
-        "top_20_share": r["top_20_share"],
-        "bottom_20_share": r["bottom_20_share"],
-    } for r in rows])
+    baseline_simulation.cache_clear()
+
+    # Build results DataFrame straight from the column store
+    columns = results["columns"]
+    df = pd.DataFrame({
+        name: columns[name] for name in (
+            "multiplier", "capital_share", "label", "market_gini", "net_gini",
+            "spm_poverty_rate", "fed_revenue", "state_revenue",
+            "total_revenue", "mean_net_income", "top_10_share",
+            "bottom_10_share", "top_20_share", "bottom_20_share",
+        )
+    })
 
     # Print summary
     print("\n" + "=" * 90)
@@ -53,31 +47,25 @@ def main():
     print("\n" + "-" * 60)
     print("REVENUE")
     print("-" * 60)
-    baseline_rev = rows[0]["total_revenue"]
-    for r in rows:
-        extra = r["total_revenue"] - baseline_rev
+    extra_revenue = df["total_revenue"] - df["total_revenue"].iloc[0]
+    for r, extra in zip(df.itertuples(), extra_revenue):
         sign = "+" if extra >= 0 else ""
-        print(f"  {r['label']:>10s}  "
-              f"Fed: ${r['fed_revenue']/1e9:>8,.1f}B  "
-              f"State: ${r['state_revenue']/1e9:>7,.1f}B  "
+        print(f"  {r.label:>10s}  "
+              f"Fed: ${r.fed_revenue/1e9:>8,.1f}B  "
+              f"State: ${r.state_revenue/1e9:>7,.1f}B  "
               f"Extra: {sign}${extra/1e9:,.1f}B")
 
     # Decile detail for baseline vs 2x vs 5x
     print("\n" + "-" * 60)
     print("DECILE SHARES (baseline vs 2x vs 5x)")
     print("-" * 60)
-    decile_rows = []
-    for r in rows:
-        if r["multiplier"] in (1.0, 2.0, 5.0):
-            for i, share in enumerate(r["decile_shares"]):
-                decile_rows.append({
-                    "scenario": r["label"],
-                    "decile": f"D{i+1}",
-                    "share": share,
-                })
-    dec_df = pd.DataFrame(decile_rows).pivot(
-        index="decile", columns="scenario", values="share"
-    )
+    row_of = {mult: i for i, mult in enumerate(columns["multiplier"])}
+    shown = [row_of[mult] for mult in (1.0, 2.0, 5.0)]
+    dec_df = pd.DataFrame(
+        columns["decile_shares"][shown].T,
+        index=[f"D{i+1}" for i in range(10)],
+        columns=[columns["label"][i] for i in shown],
+    ).rename_axis("decile")
     dec_df = dec_df[["Baseline", "2x", "5x"]]
     print(dec_df.to_string(float_format="{:.2%}".format))
 
@@ -90,11 +78,11 @@ def main():
     print(f"\nExporting to {OUTPUT_DIR}/...")
     df.to_csv(os.path.join(OUTPUT_DIR, "sweep_metrics.csv"), index=False)
 
-    decile_data = {"decile": list(range(1, 11))}
-    for r in rows:
-        key = r["label"].replace(".", "p")
-        decile_data[key] = r["decile_shares"]
-    pd.DataFrame(decile_data).to_csv(
+    keys = [label.replace(".", "p") for label in columns["label"]]
+    deciles = columns["decile_shares"].T
+    pd.DataFrame(deciles, index=range(1, 11), columns=keys).rename_axis(
+        "decile"
+    ).reset_index().to_csv(
         os.path.join(OUTPUT_DIR, "sweep_deciles.csv"), index=False
     )
 
@@ -2,46 +2,34 @@
 
 import os
 
+import numpy as np
 import pandas as pd
 
 from .labor_capital_shift import run_scenarios
 from .labor_shift_charts import generate_all as generate_charts
+from .simulation import baseline_simulation, ubi_simulation
 
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "outputs", "labor_shift")
 
 
-def main():
-    results = run_scenarios()
-
-    # Print summary table
-    print("\n" + "=" * 70)
-    print("LABOR → CAPITAL SHIFT ANALYSIS")
-    print("=" * 70)
-
-    columns = {"Metric": [
-        "Market income Gini",
-        "Net income incl. health benefits Gini",
-        "SPM poverty rate",
-        "Federal income tax revenue",
-        "Top decile resource share",
-        "Bottom decile resource share",
-    ]}
-    columns["Baseline"] = _format_row(results["baseline"])
-    for r in results["shifts"]:
-        columns[r["label"]] = _format_row(r)
-    if results["ubi"]:
-        columns[results["ubi"]["label"]] = _format_row(results["ubi"])
-
-    summary = pd.DataFrame(columns)
-    print(summary.to_string(index=False))
+# (metric label, numeric column, formatter) for the printed summary table.
+SUMMARY_FORMATS = [
+    ("Market income Gini", "market_gini", "{:.4f}".format),
+    ("Net income incl. health benefits Gini",
+     "net_gini_including_health_benefits", "{:.4f}".format),
+    ("SPM poverty rate", "spm_poverty_rate", "{:.2%}".format),
+    ("Federal income tax revenue", "fed_revenue", "${:,.0f}".format),
+    ("Top decile resource share", "top_decile_resource_share", "{:.2%}".format),
+    ("Bottom decile resource share", "bottom_decile_resource_share",
+     "{:.2%}".format),
+]
 
-    # Charts
-    print("\nGenerating visualizations...")
-    generate_charts(results, OUTPUT_DIR)
 
-    # Export CSVs
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    print("\nExporting CSV results...")
+def main():
+    # Only scalar metrics, decile shares and cached Lorenz inputs are used.
+    results = run_scenarios(include_series=False)
+    baseline_simulation.cache_clear()
+    ubi_simulation.cache_clear()
 
     rows = [results["baseline"]] + results["shifts"]
     if results["ubi"]:
@@ -62,13 +50,38 @@ def main():
             r["decile_shares_including_health_benefits"][0]
         ),
     } for r in rows])
+
+    # Print summary table
+    print("\n" + "=" * 70)
+    print("LABOR → CAPITAL SHIFT ANALYSIS")
+    print("=" * 70)
+
+    summary = pd.DataFrame(
+        [numeric[col].map(fmt).tolist() for _, col, fmt in SUMMARY_FORMATS],
+        columns=numeric["scenario"].tolist(),
+    )
+    summary.insert(0, "Metric", [label for label, _, _ in SUMMARY_FORMATS])
+    print(summary.to_string(index=False))
+
+    # Charts
+    print("\nGenerating visualizations...")
+    generate_charts(results, OUTPUT_DIR)
+
+    # Export CSVs
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    print("\nExporting CSV results...")
+
     numeric.to_csv(os.path.join(OUTPUT_DIR, "summary_metrics.csv"), index=False)
 
-    decile_data = {"decile": list(range(1, 11))}
-    for r in rows:
-        key = r["label"].lower().replace(" ", "_").replace("%", "pct")
-        decile_data[key] = r["decile_shares_including_health_benefits"]
-    pd.DataFrame(decile_data).to_csv(
+    keys = [
+        r["label"].lower().replace(" ", "_").replace("%", "pct") for r in rows
+    ]
+    deciles = np.column_stack(
+        [r["decile_shares_including_health_benefits"] for r in rows]
+    )
+    pd.DataFrame(deciles, index=range(1, 11), columns=keys).rename_axis(
+        "decile"
+    ).reset_index().to_csv(
         os.path.join(OUTPUT_DIR, "decile_shares.csv"), index=False
     )
 
@@ -76,16 +89,5 @@ def main():
     print("Done!")
 
 
-def _format_row(r):
-    return [
-        f"{r['market_gini']:.4f}",
-        f"{r['net_gini_including_health_benefits']:.4f}",
-        f"{r['spm_poverty_rate']:.2%}",
-        f"${r['fed_revenue']:,.0f}",
-        f"{r['decile_shares_including_health_benefits'][9]:.2%}",
-        f"{r['decile_shares_including_health_benefits'][0]:.2%}",
-    ]
-
-
 if __name__ == "__main__":
     main()
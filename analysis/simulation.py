@@ -1,5 +1,8 @@
 """Microsimulation scenarios for capital income doubling analysis."""
 
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
 import numpy as np
 import pandas as pd
 from policyengine_us import Microsimulation
@@ -10,68 +13,174 @@ from .fiscal import compute_ubi_amount, net_fiscal_impact, revenue_components
 from .metrics import extract_results as _extract_results
 
 
-def run_scenarios():
+@lru_cache(maxsize=1)
+def baseline_simulation():
+    """Return the process-wide baseline Microsimulation.
+
+    Construction (data load and parameter uprating) dominates runtime, so
+    scenario runs share one instance. The root is only read for input
+    variables (labor and capital income) that scenarios override on their
+    branches; those reads stay memoized on it for the life of the process.
+    Derived variables are only ever computed on branches, so none is cached
+    on the root before a scenario branches from it.
+    """
+    return Microsimulation()
+
+
+@lru_cache(maxsize=1)
+def ubi_simulation(amount):
+    """Return a Microsimulation paying a flat per-person UBI of amount.
+
+    Constructing a reformed simulation rebuilds and re-uprates the whole
+    parameter tree, so the most recent amount's instance is cached. Callers
+    must branch from the returned simulation rather than setting inputs on
+    it directly, and release the branch once its results are extracted.
+    """
+    reform = Reform.from_dict({
+        "gov.contrib.ubi_center.basic_income.amount.person.flat": {
+            f"{YEAR}-01-01.2100-12-31": amount
+        },
+    }, country_id="us")
+    return Microsimulation(reform=reform)
+
+
+def release_branch(sim, name):
+    """Drop sim's branch called name so its computed variables can be freed.
+
+    Branches are kept in sim.branches for the life of sim, and the cached
+    roots above outlive every scenario run.
+    """
+    sim.branches.pop(name, None)
+
+
+def _doubled_capital(sim):
+    """Return sim's capital income with positive values doubled, by variable.
+
+    Only positive capital income is scaled — scaling losses is an artifact
+    that distorts bottom-decile results without modeling anything real.
+    """
+    stacked = np.stack([
+        np.asarray(sim.calculate(var, period=YEAR), dtype=float)
+        for var in CAPITAL_INCOME_VARS
+    ])
+    # vals + max(vals, 0) doubles positives and leaves losses unchanged; on
+    # the stacked (n_vars, n_records) array this is one pass for all variables.
+    scaled = np.maximum(stacked, 0.0)
+    scaled += stacked
+    return dict(zip(CAPITAL_INCOME_VARS, scaled))
+
+
+def _capital_scenario(doubled, doubled_capital=None, picklable=False):
+    """Extract the baseline or doubled-capital scenario from the shared root.
+
+    Args:
+        doubled: Build the doubled-capital branch instead of the baseline.
+        doubled_capital: Precomputed _doubled_capital() arrays to reuse.
+        picklable: Replace MicroSeries in the results with plain arrays so
+            they can be returned from a worker process.
+
+    Returns:
+        Tuple of (results, revenue components, household arrays).
+    """
+    root = baseline_simulation()
+    if doubled:
+        branch_name = "doubled_capital"
+        sim = root.get_branch(branch_name)
+        if doubled_capital is None:
+            doubled_capital = _doubled_capital(root)
+        for var, scaled in doubled_capital.items():
+            sim.set_input(var, YEAR, scaled)
+        label = "Doubled capital"
+    else:
+        branch_name = "baseline"
+        sim = root.get_branch(branch_name)
+        label = "Baseline"
+
+    household_count_people = sim.calculate("household_count_people", period=YEAR)
+    household = {
+        "weights": np.asarray(sim.calculate("household_weight", period=YEAR)),
+        "household_count_people": np.asarray(household_count_people),
+        "total_population": float(household_count_people.sum()),
+        "state_codes": np.asarray(sim.calculate("state_code", period=YEAR)),
+    }
+
+    results = _extract_results(sim, label)
+    if picklable:
+        results = {
+            key: np.asarray(value) if hasattr(value, "weights") else value
+            for key, value in results.items()
+        }
+    fiscal = revenue_components(sim)
+    release_branch(root, branch_name)
+    return results, fiscal, household
+
+
+def run_scenarios(parallel=False):
     """Run all three scenarios and return results dict.
 
+    Args:
+        parallel: Extract the baseline and doubled-capital scenarios in two
+            worker processes. Each worker loads its own baseline, so this
+            trades roughly double peak memory for wall time, and the
+            returned series are plain arrays rather than MicroSeries. The
+            UBI scenario depends on both fiscal results and runs afterwards.
+
     Returns:
         Dict with keys "baseline", "doubled", "ubi", each containing
         a results dict, plus "meta" with population/household counts
         and "state_summary" DataFrame.
     """
-    print("Running baseline microsimulation...")
-    baseline = Microsimulation()
-
-    # Branch BEFORE computing downstream variables
-    # Only scale positive capital income — scaling losses is an artifact
-    # that distorts bottom-decile results without modeling anything real.
-    print("Creating doubled capital income branch...")
-    doubled = baseline.get_branch("doubled_capital")
-    for var in CAPITAL_INCOME_VARS:
-        original = baseline.calculate(var, period=YEAR)
-        vals = np.array(original)
-        doubled.set_input(var, YEAR, np.where(vals >= 0, vals * 2, vals))
-
-    weights = np.array(baseline.calculate("household_weight", period=YEAR))
-    household_count_people = baseline.calculate("household_count_people", period=YEAR)
-    total_population = float(household_count_people.sum())
-
-    baseline_results = _extract_results(baseline, "Baseline")
-    doubled_results = _extract_results(doubled, "Doubled capital")
+    if parallel:
+        print("Running baseline and doubled capital scenarios in parallel...")
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            baseline_future = pool.submit(_capital_scenario, False, picklable=True)
+            doubled_future = pool.submit(_capital_scenario, True, picklable=True)
+            baseline_results, baseline_fiscal, household = baseline_future.result()
+            doubled_results, doubled_fiscal, _ = doubled_future.result()
+        doubled_capital = None
+    else:
+        print("Running baseline microsimulation...")
+        root = baseline_simulation()
+
+        # Nothing derived is computed on the root and each scenario has its
+        # own branch, so scenarios stay isolated. The baseline capital
+        # variables are read once here and reused for the UBI branch.
+        print("Creating doubled capital income branch...")
+        doubled_capital = _doubled_capital(root)
+        baseline_results, baseline_fiscal, household = _capital_scenario(False)
+        doubled_results, doubled_fiscal, _ = _capital_scenario(
+            True, doubled_capital
+        )
+
+    weights = household["weights"]
+    total_population = household["total_population"]
 
     # State-level breakdown
-    state_codes = np.array(baseline.calculate("state_code", period=YEAR))
     state_summary = _compute_state_summary(
-        state_codes, weights,
-        np.array(baseline_results["_income_tax"]),
-        np.array(doubled_results["_income_tax"]),
-        np.array(baseline_results["_state_income_tax"]),
-        np.array(doubled_results["_state_income_tax"]),
-        np.array(household_count_people),
+        household["state_codes"], weights,
+        np.asarray(baseline_results["_income_tax"]),
+        np.asarray(doubled_results["_income_tax"]),
+        np.asarray(baseline_results["_state_income_tax"]),
+        np.asarray(doubled_results["_state_income_tax"]),
+        household["household_count_people"],
     )
 
     # UBI scenario: recycle the net fiscal gain as a flat UBI
-    baseline_fiscal = revenue_components(baseline)
-    doubled_fiscal = revenue_components(doubled)
     extra_federal_budget = net_fiscal_impact(
         doubled_fiscal, baseline_fiscal
     )["total_change"]
     ubi_amount = compute_ubi_amount(extra_federal_budget, total_population)
     print(f"UBI amount: ${ubi_amount:,.2f}/person/year (${ubi_amount/12:,.2f}/month)")
 
-    reform = Reform.from_dict({
-        "gov.contrib.ubi_center.basic_income.amount.person.flat": {
-            f"{YEAR}-01-01.2100-12-31": round(ubi_amount, 2)
-        },
-    }, country_id="us")
-
-    ubi_sim = Microsimulation(reform=reform)
-    ubi_branch = ubi_sim.get_branch("doubled_capital_ubi")
-    for var in CAPITAL_INCOME_VARS:
-        original = baseline.calculate(var, period=YEAR)
-        vals = np.array(original)
-        ubi_branch.set_input(var, YEAR, np.where(vals >= 0, vals * 2, vals))
+    ubi_root = ubi_simulation(round(ubi_amount, 2))
+    if doubled_capital is None:
+        doubled_capital = _doubled_capital(ubi_root)
+    ubi_branch = ubi_root.get_branch("doubled_capital_ubi")
+    for var, scaled in doubled_capital.items():
+        ubi_branch.set_input(var, YEAR, scaled)
 
     ubi_results = _extract_results(ubi_branch, "Doubled + UBI")
+    release_branch(ubi_root, "doubled_capital_ubi")
     ubi_results["ubi_per_person"] = ubi_amount
 
     return {
@@ -93,25 +202,30 @@ def run_scenarios():
 def _compute_state_summary(state_codes, weights, baseline_fed, doubled_fed,
                            baseline_state, doubled_state, hh_count_people):
     """Compute state-level revenue breakdown."""
-    df = pd.DataFrame({
-        "state": state_codes,
-        "weight": weights,
-        "extra_fed": doubled_fed - baseline_fed,
-        "extra_state": doubled_state - baseline_state,
-        "household_count_people": hh_count_people,
+    # Hash-based integer codes; sorting the object array is much slower.
+    inv, states = pd.factorize(state_codes, sort=True)
+    # One bincount over all weighted columns: column k's records are binned
+    # at offset k * n_states, so a single C loop fills every state total.
+    columns = np.stack([
+        (doubled_fed - baseline_fed) * weights,
+        (doubled_state - baseline_state) * weights,
+        weights,
+        hh_count_people * weights,
+    ])
+    n_states = len(states)
+    bins = (np.arange(len(columns))[:, None] * n_states + inv).ravel()
+    extra_fed, extra_state, households, population = np.bincount(
+        bins, weights=columns.ravel(), minlength=len(columns) * n_states
+    ).reshape(len(columns), n_states)
+
+    summary = pd.DataFrame({
+        "state": states,
+        "extra_fed_revenue": extra_fed,
+        "extra_state_revenue": extra_state,
+        "extra_total_revenue": extra_fed + extra_state,
+        "weighted_households": households,
+        "weighted_population": population,
     })
-    df["extra_total"] = df["extra_fed"] + df["extra_state"]
-
-    summary = df.groupby("state").apply(
-        lambda g: pd.Series({
-            "extra_fed_revenue": (g.extra_fed * g.weight).sum(),
-            "extra_state_revenue": (g.extra_state * g.weight).sum(),
-            "extra_total_revenue": (g.extra_total * g.weight).sum(),
-            "weighted_households": g.weight.sum(),
-            "weighted_population": (g.household_count_people * g.weight).sum(),
-        }),
-        include_groups=False,
-    ).reset_index()
 
     summary["extra_per_capita"] = summary["extra_total_revenue"] / summary["weighted_population"]
     return summary
@@ -2,9 +2,7 @@
 
 import os
 
-import plotly.graph_objects as go
-
-from .metrics import lorenz_curve
+import pandas as pd
 
 
 def generate_all(results, output_dir):
@@ -16,26 +14,36 @@ def generate_all(results, output_dir):
     """
     os.makedirs(output_dir, exist_ok=True)
 
-    _gini_vs_multiplier(results, output_dir)
-    _poverty_vs_multiplier(results, output_dir)
-    _revenue_vs_multiplier(results, output_dir)
-    _decile_shares(results, output_dir)
+    # One column per plotted field, built once and shared by every chart.
+    columns = results["columns"]
+    df = pd.DataFrame({
+        name: columns[name] for name in (
+            "label", "multiplier", "capital_share", "market_gini",
+            "net_gini", "spm_poverty_rate", "total_revenue",
+        )
+    })
+    df["decile_shares"] = list(columns["decile_shares"])
+    df["total_revenue_b"] = df["total_revenue"] / 1e9
+    df["extra_revenue_b"] = df["total_revenue_b"] - df["total_revenue_b"].iloc[0]
+
+    _gini_vs_multiplier(df, output_dir)
+    _poverty_vs_multiplier(df, output_dir)
+    _revenue_vs_multiplier(df, output_dir)
+    _decile_shares(df, output_dir)
 
     print(f"  Saved 4 interactive charts to {output_dir}")
 
 
-def _gini_vs_multiplier(results, output_dir):
-    rows = results["rows"]
-    mults = [r["multiplier"] for r in rows]
-    cap_shares = [r["capital_share"] for r in rows]
+def _gini_vs_multiplier(df, output_dir):
+    import plotly.graph_objects as go
 
     fig = go.Figure()
     fig.add_trace(go.Scatter(
-        x=mults, y=[r["market_gini"] for r in rows],
+        x=df["multiplier"], y=df["market_gini"],
         name="Market Gini", mode="lines+markers",
     ))
     fig.add_trace(go.Scatter(
-        x=mults, y=[r["net_gini"] for r in rows],
+        x=df["multiplier"], y=df["net_gini"],
         name="Net Gini", mode="lines+markers",
     ))
 
@@ -46,7 +54,7 @@ def _gini_vs_multiplier(results, output_dir):
         width=800, height=500,
     )
     # Add capital share as secondary x-axis labels via annotations
-    for mult, cs in zip(mults, cap_shares):
+    for mult, cs in zip(df["multiplier"], df["capital_share"]):
         fig.add_annotation(
             x=mult, y=0, yref="paper", yshift=-35,
             text=f"{cs:.0%}", showarrow=False, font=dict(size=9),
@@ -56,16 +64,17 @@ def _gini_vs_multiplier(results, output_dir):
         text="Capital share of market income",
         showarrow=False, font=dict(size=11),
     )
-    fig.write_html(os.path.join(output_dir, "gini_vs_multiplier.html"))
+    fig.write_html(
+        os.path.join(output_dir, "gini_vs_multiplier.html"), include_plotlyjs="cdn"
+    )
 
 
-def _poverty_vs_multiplier(results, output_dir):
-    rows = results["rows"]
-    mults = [r["multiplier"] for r in rows]
+def _poverty_vs_multiplier(df, output_dir):
+    import plotly.graph_objects as go
 
     fig = go.Figure()
     fig.add_trace(go.Scatter(
-        x=mults, y=[r["spm_poverty_rate"] for r in rows],
+        x=df["multiplier"], y=df["spm_poverty_rate"],
         name="SPM poverty rate", mode="lines+markers",
         line=dict(color="red"),
     ))
@@ -77,23 +86,23 @@ def _poverty_vs_multiplier(results, output_dir):
         yaxis_tickformat=".1%",
         width=800, height=500,
     )
-    fig.write_html(os.path.join(output_dir, "poverty_vs_multiplier.html"))
+    fig.write_html(
+        os.path.join(output_dir, "poverty_vs_multiplier.html"), include_plotlyjs="cdn"
+    )
 
 
-def _revenue_vs_multiplier(results, output_dir):
-    rows = results["rows"]
-    mults = [r["multiplier"] for r in rows]
-    baseline_rev = rows[0]["total_revenue"]
+def _revenue_vs_multiplier(df, output_dir):
+    import plotly.graph_objects as go
 
     fig = go.Figure()
     fig.add_trace(go.Scatter(
-        x=mults,
-        y=[r["total_revenue"] / 1e9 for r in rows],
+        x=df["multiplier"],
+        y=df["total_revenue_b"],
         name="Total revenue", mode="lines+markers",
     ))
     fig.add_trace(go.Scatter(
-        x=mults,
-        y=[(r["total_revenue"] - baseline_rev) / 1e9 for r in rows],
+        x=df["multiplier"],
+        y=df["extra_revenue_b"],
         name="Extra revenue", mode="lines+markers",
         line=dict(dash="dash"),
     ))
@@ -104,20 +113,21 @@ def _revenue_vs_multiplier(results, output_dir):
         yaxis_title="Revenue ($B)",
         width=800, height=500,
     )
-    fig.write_html(os.path.join(output_dir, "revenue_vs_multiplier.html"))
+    fig.write_html(
+        os.path.join(output_dir, "revenue_vs_multiplier.html"), include_plotlyjs="cdn"
+    )
 
 
-def _decile_shares(results, output_dir):
-    rows = results["rows"]
+def _decile_shares(df, output_dir):
+    import plotly.graph_objects as go
+
     labels = [f"D{i+1}" for i in range(10)]
 
     # Show baseline, 2x, and 5x
+    shown = df[df["multiplier"].isin((1.0, 2.0, 5.0))]
     fig = go.Figure()
-    for r in rows:
-        if r["multiplier"] in (1.0, 2.0, 5.0):
-            fig.add_trace(go.Bar(
-                name=r["label"], x=labels, y=r["decile_shares"],
-            ))
+    for label, shares in zip(shown["label"], shown["decile_shares"]):
+        fig.add_trace(go.Bar(name=label, x=labels, y=shares))
 
     fig.update_layout(
         title="Net income shares by decile",
@@ -127,4 +137,6 @@ def _decile_shares(results, output_dir):
         barmode="group",
         width=800, height=500,
     )
-    fig.write_html(os.path.join(output_dir, "decile_shares.html"))
+    fig.write_html(
+        os.path.join(output_dir, "decile_shares.html"), include_plotlyjs="cdn"
+    )
@@ -0,0 +1,27 @@
+"""Shared helpers for importing PolicyEngine-dependent modules in tests."""
+
+import importlib
+import sys
+import types
+
+
+def import_with_policyengine_stubs(module_name):
+    """Import an analysis module without requiring PolicyEngine to be installed."""
+    policyengine_us = types.ModuleType("policyengine_us")
+    policyengine_us.Microsimulation = object
+    sys.modules["policyengine_us"] = policyengine_us
+
+    policyengine_core = types.ModuleType("policyengine_core")
+    reforms = types.ModuleType("policyengine_core.reforms")
+
+    class DummyReform:
+        @staticmethod
+        def from_dict(*args, **kwargs):
+            return {"args": args, "kwargs": kwargs}
+
+    reforms.Reform = DummyReform
+    sys.modules["policyengine_core"] = policyengine_core
+    sys.modules["policyengine_core.reforms"] = reforms
+
+    module = importlib.import_module(module_name)
+    return importlib.reload(module)
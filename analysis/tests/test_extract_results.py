@@ -3,7 +3,7 @@
 import numpy as np
 import pytest
 
-from analysis.metrics import extract_results
+from analysis.metrics import extract_results, lorenz_curve
 
 
 def _weighted_gini(values, weights):
@@ -88,6 +88,41 @@ def test_extract_results_includes_health_inclusive_resources():
     assert results["aca_ptc_total"] == pytest.approx(90.0)
 
 
+def test_extract_results_caches_lorenz_inputs():
+    weights = np.array([1.0, 2.0, 1.0])
+    net_income = [300.0, 100.0, 200.0]
+    sim = FakeSimulation(
+        {
+            "household_net_income": FakeSeries(net_income, weights),
+            "household_net_income_including_health_benefits": FakeSeries(
+                [310.0, 150.0, 210.0], weights
+            ),
+            "household_market_income": FakeSeries([320.0, 90.0, 220.0], weights),
+            "income_tax": FakeSeries([30.0, 10.0, 20.0], weights),
+            "state_income_tax": FakeSeries([3.0, 1.0, 2.0], weights),
+            "healthcare_benefit_value": FakeSeries([10.0, 50.0, 10.0], weights),
+            "medicaid_cost": FakeSeries([0.0, 40.0, 0.0], weights),
+            "per_capita_chip": FakeSeries([0.0, 10.0, 0.0], weights),
+            "assigned_aca_ptc": FakeSeries([10.0, 0.0, 10.0], weights),
+            "spm_unit_is_in_spm_poverty": FakeSeries([0.0, 1.0, 0.0], weights),
+        }
+    )
+
+    results = extract_results(sim, "Lorenz")
+
+    x, expected = lorenz_curve(net_income, weights)
+    np.testing.assert_allclose(np.interp(x, *results["_lorenz_raw"]), expected)
+    pop_fracs, income_fracs = results["_lorenz_raw_including_health_benefits"]
+    assert pop_fracs[0] == 0.0
+    assert income_fracs[-1] == pytest.approx(1.0)
+
+    slim = extract_results(sim, "Lorenz", include_series=False)
+    assert "_net_income" not in slim
+    assert "_income_tax" not in slim
+    assert slim["net_gini"] == results["net_gini"]
+    np.testing.assert_array_equal(slim["_lorenz_raw"][1], results["_lorenz_raw"][1])
+
+
 def test_extract_results_falls_back_to_aca_ptc_when_assigned_variant_missing():
     weights = np.ones(2)
     sim = FakeSimulation(
@@ -7,6 +7,7 @@ import numpy as np
 import pytest
 
 from analysis.fiscal import compute_ubi_amount, net_fiscal_impact
+from analysis.tests._stubs import import_with_policyengine_stubs
 
 
 class TestLaborShiftMath:
@@ -173,6 +174,36 @@ class TestMarketIncomeConservation:
 
         return scaled_vars, total_added
 
+    @pytest.mark.parametrize(
+        "capital_vars",
+        [
+            {
+                "ltcg": np.array([5000.0, -1000.0, 2000.0, 0.0]),
+                "stcg": np.array([-300.0, 800.0, 0.0, 150.0]),
+                "interest": np.array([200.0, 100.0, 50.0, 25.0]),
+            },
+            {
+                "ltcg": np.array([-5000.0, -1000.0, 0.0, 0.0]),
+                "stcg": np.array([0.0, -800.0, -20.0, 0.0]),
+            },
+        ],
+        ids=["mixed", "no_positive_holdings"],
+    )
+    def test_production_kernel_matches_loop(self, capital_vars):
+        """labor_capital_shift._redistribute_capital agrees with the loop."""
+        labor_shift = import_with_policyengine_stubs(
+            "analysis.labor_capital_shift"
+        )
+        weights = np.array([1.0, 2.5, 0.5, 3.0])
+
+        expected, _ = self._redistribute(capital_vars, weights, 12345.0)
+        scaled = labor_shift._redistribute_capital(
+            np.stack(list(capital_vars.values())), weights, 12345.0
+        )
+
+        for name, row in zip(capital_vars, scaled):
+            np.testing.assert_allclose(row, expected[name], rtol=1e-12)
+
     def test_conservation_no_losses(self):
         """With all-positive capital income, freed == added exactly."""
         emp = np.array([100000.0, 50000.0, 75000.0])
@@ -1,17 +1,23 @@
 """Unit tests for inequality metrics (no PolicyEngine dependency needed).
 
-Gini is provided by microdf (MicroSeries.gini()) and tested there.
-These tests cover decile shares and Lorenz curve utilities.
+MicroSeries.gini() is tested in microdf; the shared-sort Gini used for net
+income is checked here against the same formula. These tests also cover
+decile shares and Lorenz curve utilities.
 """
 
 import numpy as np
 import pytest
 
 from analysis.metrics import (
+    _cumulative_by_value,
+    _gini_from_cumulative,
+    assign_deciles,
     compute_decile_shares,
     compute_top_share,
     compute_top_shares,
     lorenz_curve,
+    sorted_weighted,
+    weighted_gini,
 )
 
 
@@ -23,7 +29,7 @@ class TestDecileShares:
         shares = compute_decile_shares(values, weights)
 
         assert len(shares) == 10
-        assert sum(shares) == pytest.approx(1.0)
+        assert shares.sum() == pytest.approx(1.0)
         for s in shares:
             assert s == pytest.approx(0.1, abs=0.02)
 
@@ -35,7 +41,7 @@ class TestDecileShares:
         shares = compute_decile_shares(values, weights)
 
         assert len(shares) == 10
-        assert sum(shares) == pytest.approx(1.0, abs=1e-6)
+        assert shares.sum() == pytest.approx(1.0, abs=1e-6)
 
     def test_top_decile_largest(self):
         """With skewed income, top decile has largest share."""
@@ -45,7 +51,7 @@ class TestDecileShares:
         shares = compute_decile_shares(values, weights)
 
         assert shares[9] > shares[0]
-        assert shares[9] == max(shares)
+        assert shares[9] == shares.max()
 
     def test_quintiles(self):
         """Can compute quintile shares (n=5)."""
@@ -54,7 +60,7 @@ class TestDecileShares:
         shares = compute_decile_shares(values, weights, n=5)
 
         assert len(shares) == 5
-        assert sum(shares) == pytest.approx(1.0)
+        assert shares.sum() == pytest.approx(1.0)
 
     def test_weighted_records_are_split_across_deciles(self):
         """A large weight should be apportioned across every bucket it spans."""
@@ -68,6 +74,155 @@ class TestDecileShares:
         assert shares[:9] == pytest.approx([expected_low] * 9)
         assert shares[9] == pytest.approx(expected_high)
 
+    def test_uniform_weight_fast_path_matches_weighted_path(self):
+        """Partition-based shares for equal weights match the sorted path."""
+        rng = np.random.default_rng(7)
+        values = rng.lognormal(10, 2, size=997)
+        nudged = np.ones(997)
+        nudged[0] = 1 + 1e-12  # forces the general weighted path
+
+        for n in (5, 10, 7):
+            np.testing.assert_allclose(
+                compute_decile_shares(values, np.full(997, 2.0), n=n),
+                compute_decile_shares(values, 2.0 * nudged, n=n),
+                rtol=1e-9,
+            )
+
+
+class TestAssignDeciles:
+    def test_labels_follow_input_order(self):
+        rng = np.random.default_rng(4)
+        values = rng.permutation(50).astype(float)
+        weights = rng.uniform(0.5, 2.0, size=50)
+        labels = assign_deciles(values, weights)
+
+        assert labels.min() == 1 and labels.max() == 10
+        assert np.all(np.diff(labels[np.argsort(values)]) >= 0)
+        np.testing.assert_array_equal(
+            assign_deciles(values[::-1], weights[::-1]), labels[::-1]
+        )
+
+    def test_matches_rank_based_digitize(self):
+        """Same cuts as digitizing sorted positions at weighted edges."""
+        rng = np.random.default_rng(21)
+        values = np.round(rng.lognormal(10, 1, size=600), -3)
+        weights = rng.uniform(0.1, 4.0, size=600)
+
+        order = np.argsort(values, kind="stable")
+        cum = np.cumsum(weights[order])
+        edges = [np.searchsorted(cum, cum[-1] * i / 10) for i in range(1, 10)]
+        expected = np.zeros(600, dtype=int)
+        expected[order] = np.digitize(np.arange(600), edges) + 1
+
+        np.testing.assert_array_equal(assign_deciles(values, weights), expected)
+        assert assign_deciles(np.array([]), np.array([])).size == 0
+
+
+class TestSharedSortGini:
+    def _microdf_gini(self, values, weights):
+        """MicroSeries.gini() formula, reproduced for comparison."""
+        order = np.argsort(values, kind="mergesort")
+        cumw = np.cumsum(weights[order])
+        cumxw = np.cumsum(values[order] * weights[order])
+        return np.sum(cumxw[1:] * cumw[:-1] - cumxw[:-1] * cumw[1:]) / (
+            cumxw[-1] * cumw[-1]
+        )
+
+    def test_matches_microdf_formula(self):
+        rng = np.random.default_rng(42)
+        values = rng.lognormal(10, 2, size=500)
+        weights = rng.uniform(0.5, 2.0, size=500)
+
+        gini = _gini_from_cumulative(*_cumulative_by_value(values, weights))
+        assert gini == pytest.approx(self._microdf_gini(values, weights))
+
+    def test_perfect_equality_and_zero_income(self):
+        weights = np.ones(10)
+        equal = _cumulative_by_value(np.full(10, 50.0), weights)
+        zero = _cumulative_by_value(np.zeros(10), weights)
+
+        assert _gini_from_cumulative(*equal) == pytest.approx(0.0)
+        assert _gini_from_cumulative(*zero) == 0.0
+
+    def test_weighted_gini_handles_concentration_and_negatives(self):
+        """One earner among N equal weights -> Gini of 1 - 1/N."""
+        values = np.zeros(10)
+        values[3] = 500.0
+        assert weighted_gini(values, np.ones(10)) == pytest.approx(0.9)
+
+        values = np.array([-50.0, 0.0, 20.0, 80.0, 400.0])
+        weights = np.array([1.0, 3.0, 2.0, 0.5, 1.5])
+        assert weighted_gini(values, weights) == pytest.approx(
+            self._microdf_gini(values, weights)
+        )
+
+    def test_weighted_gini_agrees_with_shared_path(self):
+        rng = np.random.default_rng(3)
+        values = rng.normal(5e4, 4e4, size=800)
+        weights = rng.uniform(0.1, 5.0, size=800)
+
+        assert weighted_gini(values, weights) == pytest.approx(
+            _gini_from_cumulative(*_cumulative_by_value(values, weights)),
+            rel=1e-12,
+        )
+        assert weighted_gini(np.array([]), np.array([])) == 0.0
+        assert weighted_gini(np.array([7.0]), np.array([2.0])) == pytest.approx(0.0)
+
+
+class TestConstantIncomes:
+    def test_constant_values_skip_the_sort(self):
+        """Equal incomes give exact zero Gini, flat shares and the diagonal."""
+        values = np.full(37, 120.0)
+        weights = np.linspace(0.5, 3.0, 37)
+
+        assert weighted_gini(values, weights) == 0.0
+        np.testing.assert_array_equal(
+            compute_decile_shares(values, weights, n=4), np.full(4, 0.25)
+        )
+        x, y = lorenz_curve(values, weights, n_points=11)
+        np.testing.assert_array_equal(x, y)
+
+    def test_constant_shares_match_sorted_path(self):
+        """The shortcut agrees with the general path for any sign of income."""
+        weights = np.linspace(0.5, 3.0, 37)
+        for income in (120.0, 0.0, -10.0):
+            values = np.full(37, income)
+            np.testing.assert_allclose(
+                compute_decile_shares(values, weights, n=5),
+                compute_decile_shares(sorted_weighted(values, weights), n=5),
+            )
+
+
+class TestSortedWeighted:
+    def test_handle_matches_raw_arrays(self):
+        """One SortedWeighted feeds all three metrics with unchanged results."""
+        rng = np.random.default_rng(11)
+        values = rng.lognormal(10, 1.5, size=400)
+        weights = rng.uniform(0.5, 3.0, size=400)
+        handle = sorted_weighted(values, weights)
+
+        assert weighted_gini(handle) == pytest.approx(
+            weighted_gini(values, weights)
+        )
+        np.testing.assert_allclose(
+            compute_decile_shares(handle, n=5),
+            compute_decile_shares(values, weights, n=5),
+        )
+        for got, expected in zip(
+            lorenz_curve(handle, n_points=20),
+            lorenz_curve(values, weights, n_points=20),
+        ):
+            np.testing.assert_allclose(got, expected)
+
+    @pytest.mark.parametrize(
+        "metric",
+        [weighted_gini, compute_decile_shares, lorenz_curve, compute_top_shares],
+    )
+    def test_raw_values_require_weights(self, metric):
+        """Omitting weights is only valid for a SortedWeighted."""
+        with pytest.raises(TypeError, match="weights required"):
+            metric(np.array([1.0, 2.0, 3.0]))
+
 
 class TestLorenzCurve:
     def test_perfect_equality(self):
@@ -78,6 +233,7 @@ class TestLorenzCurve:
 
         assert len(x) == 50
         assert len(y) == 50
+        assert not x.flags.writeable
         np.testing.assert_allclose(y, x, atol=0.02)
 
     def test_endpoints(self):
@@ -136,3 +292,23 @@ class TestTopShares:
         shares = compute_top_shares(values, weights, top_fractions=(0.10, 0.01))
         assert set(shares) == {0.10, 0.01}
         assert shares[0.10] >= shares[0.01]
+
+    def test_top_shares_match_per_record_overlap(self):
+        """Cumulative lookup equals summing each record's overlap with the top."""
+        rng = np.random.default_rng(9)
+        values = rng.normal(5e4, 6e4, size=300)
+        weights = rng.uniform(0.1, 4.0, size=300)
+
+        order = np.argsort(values, kind="stable")
+        v, w = values[order], weights[order]
+        upper = np.cumsum(w)
+        for top_fraction in (0.5, 0.10, 0.01):
+            cutoff = (1 - top_fraction) * upper[-1]
+            overlap = np.clip(upper - np.maximum(upper - w, cutoff), 0, None)
+            expected = (v * overlap).sum() / (v * w).sum()
+            assert compute_top_share(values, weights, top_fraction) == (
+                pytest.approx(expected)
+            )
+
+        with pytest.raises(ValueError):
+            compute_top_shares(values, weights, top_fractions=(0.1, 0.0))
@@ -1,34 +1,12 @@
 """Regression tests for analysis helpers that previously mis-modeled scenarios."""
 
-import importlib
-import sys
-import types
+import pickle
 
 import numpy as np
 import pandas as pd
 import pytest
 
-
-def _import_with_policyengine_stubs(module_name):
-    """Import an analysis module without requiring PolicyEngine to be installed."""
-    policyengine_us = types.ModuleType("policyengine_us")
-    policyengine_us.Microsimulation = object
-    sys.modules["policyengine_us"] = policyengine_us
-
-    policyengine_core = types.ModuleType("policyengine_core")
-    reforms = types.ModuleType("policyengine_core.reforms")
-
-    class DummyReform:
-        @staticmethod
-        def from_dict(*args, **kwargs):
-            return {"args": args, "kwargs": kwargs}
-
-    reforms.Reform = DummyReform
-    sys.modules["policyengine_core"] = policyengine_core
-    sys.modules["policyengine_core.reforms"] = reforms
-
-    module = importlib.import_module(module_name)
-    return importlib.reload(module)
+from analysis.tests._stubs import import_with_policyengine_stubs
 
 
 class FakeSeries:
@@ -82,6 +60,22 @@ class FakeSimulation:
         return self.series_by_var[var]
 
 
+class RecordingSimulation(FakeSimulation):
+    """FakeSimulation that logs calculated variables and names its branches."""
+
+    def __init__(self, series_by_var):
+        super().__init__(series_by_var)
+        self.calculated = []
+        self.branches = {}
+
+    def get_branch(self, branch_name):
+        return self.branches.setdefault(branch_name, FakeBranch())
+
+    def calculate(self, var, period=None, map_to=None):
+        self.calculated.append(var)
+        return super().calculate(var, period=period, map_to=map_to)
+
+
 def _capital_series_by_var(weights, overrides=None):
     overrides = overrides or {}
     base = {
@@ -97,7 +91,7 @@ def _capital_series_by_var(weights, overrides=None):
 
 
 def test_apply_shift_conserves_labor_income_without_payroll_uplift():
-    labor_shift = _import_with_policyengine_stubs("analysis.labor_capital_shift")
+    labor_shift = import_with_policyengine_stubs("analysis.labor_capital_shift")
 
     weights = np.array([1.0, 2.0, 1.0])
     series = {
@@ -137,8 +131,127 @@ def test_apply_shift_conserves_labor_income_without_payroll_uplift():
     assert total_added == pytest.approx(total_freed)
 
 
+def test_shared_root_is_cached_and_only_read_for_inputs():
+    simulation = import_with_policyengine_stubs("analysis.simulation")
+    labor_shift = import_with_policyengine_stubs("analysis.labor_capital_shift")
+    capital_sweep = import_with_policyengine_stubs("analysis.capital_share_sweep")
+
+    weights = np.array([1.0, 2.0, 1.0])
+    root = RecordingSimulation({
+        "employment_income": FakeSeries([100.0, 50.0, 0.0], weights),
+        "self_employment_income": FakeSeries([20.0, -10.0, 10.0], weights),
+        **_capital_series_by_var(
+            weights,
+            overrides={
+                "rental_income": FakeSeries([10.0, -5.0, 5.0], weights),
+            },
+        ),
+    })
+    constructed = []
+    simulation.Microsimulation = lambda: constructed.append(root) or root
+    simulation.baseline_simulation.cache_clear()
+
+    assert simulation.baseline_simulation() is root
+    assert simulation.baseline_simulation() is root
+    assert len(constructed) == 1
+
+    simulation._doubled_capital(root)
+    labor_shift._apply_shift(root, "shift_10", 0.1)
+    capital_sweep._apply_multipliers(root, ["cap_200"], [2.0])
+
+    inputs = set(simulation.CAPITAL_INCOME_VARS) | {
+        "employment_income", "self_employment_income",
+    }
+    assert set(root.calculated) <= inputs
+    simulation.baseline_simulation.cache_clear()
+
+
+def test_state_summary_matches_groupby_reference():
+    simulation = import_with_policyengine_stubs("analysis.simulation")
+
+    rng = np.random.default_rng(17)
+    n = 400
+    state_codes = rng.choice(["WY", "CA", "NY", "TX", "AK", "FL"], n).astype(object)
+    weights = rng.uniform(0.5, 5.0, n)
+    baseline_fed, doubled_fed, baseline_state, doubled_state = (
+        rng.normal(1e4, 5e3, n) for _ in range(4)
+    )
+    hh_count_people = rng.integers(1, 6, n).astype(float)
+
+    summary = simulation._compute_state_summary(
+        state_codes, weights, baseline_fed, doubled_fed,
+        baseline_state, doubled_state, hh_count_people,
+    )
+
+    frame = pd.DataFrame({
+        "state": state_codes,
+        "extra_fed_revenue": (doubled_fed - baseline_fed) * weights,
+        "extra_state_revenue": (doubled_state - baseline_state) * weights,
+        "weighted_households": weights,
+        "weighted_population": hh_count_people * weights,
+    })
+    frame["extra_total_revenue"] = (
+        frame["extra_fed_revenue"] + frame["extra_state_revenue"]
+    )
+    expected = frame.groupby("state", as_index=False).sum()
+    expected["extra_per_capita"] = (
+        expected["extra_total_revenue"] / expected["weighted_population"]
+    )
+
+    pd.testing.assert_frame_equal(
+        summary, expected[summary.columns], check_dtype=False
+    )
+
+
+class ScenarioSeries(FakeSeries):
+    def mean(self):
+        return float((self.values * self.weights).sum() / self.weights.sum())
+
+    def gini(self):
+        return 0.0
+
+
+class ScenarioSimulation:
+    """Returns a small series for any variable, enough for a full scenario."""
+
+    def __init__(self):
+        self.branches = {}
+
+    def get_branch(self, branch_name):
+        return self.branches.setdefault(branch_name, ScenarioSimulation())
+
+    def set_input(self, var, year, values):
+        pass
+
+    def calculate(self, var, period=None, map_to=None):
+        if var == "state_code":
+            return np.array(["CA", "NY", "CA", "TX"], dtype=object)
+        return ScenarioSeries([1.0, 2.0, 3.0, 4.0], [1.0, 1.0, 2.0, 1.0])
+
+
+def test_picklable_capital_scenario_returns_plain_arrays():
+    simulation = import_with_policyengine_stubs("analysis.simulation")
+    simulation.Microsimulation = ScenarioSimulation
+    simulation.baseline_simulation.cache_clear()
+
+    for doubled in (False, True):
+        results, fiscal, household = simulation._capital_scenario(
+            doubled, picklable=True
+        )
+        restored = pickle.loads(pickle.dumps((results, fiscal, household)))
+
+        assert not any(hasattr(value, "weights") for value in results.values())
+        np.testing.assert_array_equal(
+            restored[0]["_income_tax"], [1.0, 2.0, 3.0, 4.0]
+        )
+        assert restored[2]["total_population"] == pytest.approx(13.0)
+        assert restored[2]["state_codes"].tolist() == ["CA", "NY", "CA", "TX"]
+        assert simulation.baseline_simulation().branches == {}
+    simulation.baseline_simulation.cache_clear()
+
+
 def test_capital_share_uses_actual_positive_only_totals():
-    capital_sweep = _import_with_policyengine_stubs("analysis.capital_share_sweep")
+    capital_sweep = import_with_policyengine_stubs("analysis.capital_share_sweep")
 
     weights = np.array([1.0, 1.0, 1.0])
     sim = FakeSimulation(
@@ -157,8 +270,76 @@ def test_capital_share_uses_actual_positive_only_totals():
     assert share == pytest.approx(90.0 / 350.0)
 
 
+def test_scale_non_negative_matches_masked_where():
+    capital_sweep = import_with_policyengine_stubs("analysis.capital_share_sweep")
+
+    vals = np.array([100.0, -500.0, 0.0, 50.0, -10.0])
+    for mult in (0.5, 2.0, 5.0):
+        np.testing.assert_array_equal(
+            capital_sweep._scale_non_negative(vals, mult),
+            np.where(vals >= 0, vals * mult, vals),
+        )
+    assert vals.tolist() == [100.0, -500.0, 0.0, 50.0, -10.0]
+
+    mults = np.array([1.0, 2.0, 5.0])[:, None]
+    np.testing.assert_array_equal(
+        capital_sweep._scale_non_negative(vals, mults),
+        np.where(vals >= 0, vals * mults, vals),
+    )
+
+
+@pytest.mark.parametrize("positive_only", [True, False])
+def test_apply_multipliers_aligns_branches_with_multipliers(positive_only):
+    capital_sweep = import_with_policyengine_stubs("analysis.capital_share_sweep")
+
+    weights = np.array([1.0, 1.0, 1.0])
+    gains = np.array([100.0, -10.0, 0.0])
+    root = RecordingSimulation(_capital_series_by_var(
+        weights,
+        overrides={"long_term_capital_gains": FakeSeries(gains, weights)},
+    ))
+
+    branches = capital_sweep._apply_multipliers(
+        root, ["cap_150", "cap_300"], [1.5, 3.0], positive_only=positive_only
+    )
+
+    assert branches == [root.branches["cap_150"], root.branches["cap_300"]]
+    for branch, mult in zip(branches, (1.5, 3.0)):
+        if positive_only:
+            expected = np.where(gains >= 0, gains * mult, gains)
+        else:
+            expected = gains * mult
+        np.testing.assert_array_equal(
+            branch.inputs["long_term_capital_gains"], expected
+        )
+        assert set(branch.inputs) == set(capital_sweep.CAPITAL_INCOME_VARS)
+
+
+def test_sweep_to_rows_restores_per_multiplier_dicts():
+    capital_sweep = import_with_policyengine_stubs("analysis.capital_share_sweep")
+
+    columns = {
+        name: np.array([1.0, 2.0]) * (k + 1)
+        for k, name in enumerate(capital_sweep.SWEEP_COLUMNS)
+    }
+    columns["label"] = ["Baseline", "2x"]
+    columns["decile_shares"] = np.tile(np.full(10, 0.1), (2, 1))
+
+    rows = capital_sweep.to_rows(columns)
+    required = {
+        "label", "multiplier", "capital_share", "market_gini",
+        "net_gini", "spm_poverty_rate", "fed_revenue", "state_revenue",
+        "total_revenue", "decile_shares", "top_10_share", "bottom_10_share",
+    }
+    assert len(rows) == 2
+    assert set(rows[1]) >= required
+    assert rows[1]["label"] == "2x"
+    assert rows[1]["multiplier"] == 2.0
+    assert rows[0]["decile_shares"] == pytest.approx([0.1] * 10)
+
+
 def test_major_exposure_uses_detailed_employment_weights():
-    occupation = _import_with_policyengine_stubs("analysis.compute_occupation_shock")
+    occupation = import_with_policyengine_stubs("analysis.compute_occupation_shock")
 
     tasks = pd.DataFrame(
         {
@@ -187,7 +368,7 @@ def test_major_exposure_uses_detailed_employment_weights():
 
 
 def test_shift_sweep_uses_fresh_simulation_for_each_shift_level():
-    sweep = _import_with_policyengine_stubs("analysis.compute_shift_sweep")
+    sweep = import_with_policyengine_stubs("analysis.compute_shift_sweep")
 
     created = []
 
@@ -6,6 +6,10 @@ Tests the _apply_multiplier helper logic and result structure validation.
 import numpy as np
 import pytest
 
+# Shared by every fake row; read-only so no test can mutate it in place.
+_DECILE_TEMPLATE = 0.01 * np.arange(1, 11)
+_DECILE_TEMPLATE.setflags(write=False)
+
 
 class TestPositiveOnlyScaling:
     """Test the positive-only scaling logic used across all scenarios."""
@@ -70,7 +74,7 @@ class TestSweepResultStructure:
             "total_revenue": 2.7e12 * mult,
             "mean_net_income": 80000 + 5000 * (mult - 1),
             "mean_market_income": 90000 + 5000 * (mult - 1),
-            "decile_shares": [0.01 * i + 0.01 for i in range(10)],
+            "decile_shares": _DECILE_TEMPLATE,
             "top_10_share": 0.38 + 0.03 * (mult - 1),
             "bottom_10_share": 0.01,
             "top_20_share": 0.53,
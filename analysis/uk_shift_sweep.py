@@ -8,7 +8,7 @@ from importlib.metadata import PackageNotFoundError, version
 
 import numpy as np
 
-from .metrics import compute_top_shares
+from .metrics import assign_deciles, compute_top_shares
 from .policyengine_runtime import managed_uk_microsimulation, policyengine_bundle
 
 YEAR = 2026
@@ -579,16 +579,7 @@ def _uk_decile_impacts(baseline_sim, scenario_sims):
         baseline_sim.calculate("household_net_income", period=YEAR), dtype=float
     )
 
-    sorted_idx = np.argsort(market)
-    sorted_weights = weights[sorted_idx]
-    cum = np.cumsum(sorted_weights)
-    total = cum[-1]
-    edges = [np.searchsorted(cum, total * i / 10) for i in range(1, 10)]
-    decile_of_sorted = np.digitize(
-        np.arange(len(sorted_idx)), edges, right=False
-    ) + 1
-    decile_labels = np.zeros_like(market, dtype=int)
-    decile_labels[sorted_idx] = decile_of_sorted
+    decile_labels = assign_deciles(market, weights)
 
     def _decile_stats(net_values):
         rows = []
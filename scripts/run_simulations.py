@@ -21,6 +21,7 @@ from analysis.income_distribution_breakdown import (
     build_income_distribution_payload,
 )
 from analysis.labor_capital_shift import run_scenarios as run_labor_shift_scenarios
+from analysis.simulation import baseline_simulation, ubi_simulation
 from analysis.website_exports import labor_shift_website_payload
 
 DATA_DIR = "src/data"
@@ -292,6 +293,9 @@ def gen_labor_shift():
     print("Generating laborShiftData.json...")
     print("  Running corrected labor-shift analysis pipeline...")
     results = run_labor_shift_scenarios()
+    # Free the cached simulations before the later generators build their own.
+    baseline_simulation.cache_clear()
+    ubi_simulation.cache_clear()
     result = labor_shift_website_payload(results)
     with open(f"{DATA_DIR}/laborShiftData.json", "w") as f:
         json.dump(result, f, indent=2)